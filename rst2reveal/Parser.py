@@ -1,71 +1,268 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
-try:
-    import locale
-
-    locale.setlocale(locale.LC_ALL, "")
-except ImportError:
-    pass
-
+import locale
 import os
-import subprocess
+import re
+import html
 import shutil
+import stat
 import json
-import docutils.core
+import copy
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib import metadata
 from pathlib import Path
 from datetime import datetime
-from xml.etree import ElementTree
-from typing import Optional
+from typing import BinaryIO, Iterable, Optional
 
-from .RevealTranslator import RST2RevealTranslator, RST2RevealWriter
-
-# Import custom directives
 from . import (
+    __version__,
     REVEAL_PATH,
+    REVEAL_IGNORED,
     PYGMENTS_CSS_PATH,
-    PYGMENTS_STYLES,
+    HAS_PYGMENTS,
+    HAS_MATPLOTLIB,
     STATIC_CSS_PATH,
     STATIC_TMP_PATH,
 )
+from .utils import copy_file, copytree_mt, fast_rmtree, link_or_copy, map_file, move
+
+# docutils emits flat ``<meta attr="value" ... />`` tags, one per line
+_META_TAG_RE = re.compile(r"<meta\s([^>]*?)/?>")
+_META_ATTR_RE = re.compile(r'([\w-]+)="([^"]*)"')
+
+# File stored in the output folder identifying what it was built from
+BUILD_STAMP_NAME = ".rst2reveal.cache"
 
-# TODO: Make clean imports and not these
-from .VideoDirective import *
-from .directives import *
-from .roles import *
+# First line of generated pygments stylesheets
+PYGMENTS_CSS_HEADER = "/* Generated by pygments %s */\n"
 
+# Output is written in big chunks
+_WRITE_BUFSIZE = 256 * 1024
 
-def write_pygments_css(
-    pygments_style: Optional[str] = None,
-):  # -> Generator[Path, None, None] not working
+# Presentation language, looked up once
+try:
+    _DEFAULT_LANG = locale.getdefaultlocale()[0] or "en"
+except ValueError:
+    _DEFAULT_LANG = "en"
+
+# Indentation of lines inserted into the HTML templates
+_I4 = "    "
+_I6 = "      "
+_I10 = "          "
+
+# Reveal.js configuration options not depending on user arguments
+REVEAL_CONFIG = {
+    "history": True,
+    "overview": True,
+    "keyboard": True,
+    "loop": False,
+    "touch": True,
+    "rtl": False,
+    "hash": True,
+    "backgroundTransition": "convex",
+    "pdfSeparateFragments": False,
+    "center": True,
+    "mouseWheel": False,
+    "fragments": True,
+    "rollingLinks": False,
+    "highlight": {"highlightOnLoad": False},
+}
+
+# HTML skeleton of the presentation
+HEADER_TEMPLATE = """\
+<!doctype html>
+<html lang="%(lang)s">
+  <head>
+    <meta charset="utf-8">
+    <title>%(title)s</title>
+    <meta name="description" content="%(title)s">
+%(meta)s\
+    <meta name="apple-mobile-web-app-capable" content="yes" />
+    <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=5.0, user-scalable=no">
+    <link rel="stylesheet" href="dist/reveal.css">
+    <link rel="stylesheet" href="dist/theme/%(theme)s.css" id="theme">
+    <link rel="stylesheet" href="css/print/pdf.css" type="text/css" media="print">
+    %(pygments_css)s
+    %(rst2reveal_css)s
+    <!-- Extra styles -->
+    %(custom_css)s
+  </head>
+"""
+
+TITLESLIDE_TEMPLATE = """\
+        <section class="titleslide">
+          <h1>%(title)s</h1>
+          <h3>%(subtitle)s</h3>
+          <br>
+%(authors)s\
+          <p>%(date)s</p>
+        </section>
+"""
+
+# Constant HTML fragments are kept encoded
+BODY_OPEN = b"""\
+  <body>
+    <div class="reveal">
+      <div class="slides">
+"""
+
+BODY_CLOSE = b"""\
+      </div>
+    </div>
+"""
+
+BODY_END_TEMPLATE = """\
+    <script src="dist/reveal.js"></script>
+    <script src="plugin/zoom/zoom.js"></script>
+    <script src="plugin/notes/notes.js"></script>
+    <script src="plugin/search/search.js"></script>
+    <script src="plugin/markdown/markdown.js"></script>
+    <script src="plugin/highlight/highlight.js"></script>
+    <script src="plugin/math/math.js"></script>
+    <script>
+      Reveal.initialize({
+        %(config)s,
+        math: {
+          // mathjax: 'https://cdnjs.cloudflare.com/ajax/libs/mathjax/2.7.0/MathJax.js',
+          config: 'TeX-AMS_HTML-full',
+          TeX: {
+            Macros: {
+              R: '\\mathbb{R}',
+              set: [ '\\left\\{#1 \\; ; \\; #2\\right\\}', 2 ]
+            }
+          }
+        },
+        // Learn about plugins: https://revealjs.com/plugins/
+        plugins: [ RevealMath, RevealZoom, RevealNotes, RevealSearch, RevealMarkdown, RevealHighlight ]
+        // Full list of configuration options available here:
+        // https://github.com/hakimel/reveal.js#configuration
+      });
+    </script>
+  </body>
+</html>
+"""
+
+
+@lru_cache(maxsize=None)
+def write_pygments_css(pygments_style: str = "default") -> Path:
     """
-    Generates pygments style ``css`` for a given theme, all themes are
-    generated if no theme is passed
+    Generates pygments style ``css`` for a given theme and returns its path.
+    Generated files start with the pygments version that wrote them, and are
+    reused only while it is the installed one
     """
-    for style in PYGMENTS_STYLES:
-        if pygments_style is not None and style != pygments_style:
-            continue
-        style_path = PYGMENTS_CSS_PATH / f"{style}.css"
-        with style_path.open("w", encoding="utf-8") as css:
-            cmd_out = subprocess.run(
-                f"pygmentize -S {style} -f html -a pre.code.literal-block".split(),
-                capture_output=True,
-            )
-            if cmd_out.stderr:
-                # Some styles raise errors, use 'default' as fallback
-                print(
-                    "ERROR: Something went wrong when writting CSS: "
-                    + cmd_out.stderr.decode()
-                    + "Falling back to 'default' style."
-                )
-                style = "default"
-                style_path = PYGMENTS_CSS_PATH / f"{style}.css"
-                cmd_out = subprocess.run(
-                    f"pygmentize -S {style} -f html -a pre.code.literal-block",
-                    capture_output=True,
-                )
-            css.write(cmd_out.stdout.decode())
-        yield style_path
+    import pygments
+    from pygments.formatters import HtmlFormatter
+    from pygments.util import ClassNotFound
+
+    style_path = PYGMENTS_CSS_PATH / f"{pygments_style}.css"
+    header = PYGMENTS_CSS_HEADER % pygments.__version__
+    try:
+        with style_path.open(encoding="utf-8") as style_file:
+            if style_file.readline() == header:
+                return style_path
+    except OSError:
+        pass
+    try:
+        css = HtmlFormatter(style=pygments_style).get_style_defs(
+            "pre.code.literal-block"
+        )
+    except ClassNotFound as e:
+        # Some styles raise errors, use 'default' as fallback
+        print(
+            f"ERROR: Something went wrong when writting CSS: {e}\n"
+            "Falling back to 'default' style."
+        )
+        css = HtmlFormatter(style="default").get_style_defs(
+            "pre.code.literal-block"
+        )
+    # Written aside and renamed, so the file is never rewritten in place
+    partial_path = style_path.with_name(f"{style_path.name}.{os.getpid()}.part")
+    partial_path.write_text(header + css, encoding="utf-8")
+    os.replace(partial_path, style_path)
+    return style_path
+
+
+@lru_cache(maxsize=None)
+def _dependency_versions() -> tuple[str, ...]:
+    """
+    Versions of the libraries output depends on: docutils, pygments (code
+    highlighting) and matplotlib (plots). They are read from the installed
+    distributions, so matplotlib is not imported just to check a build
+    """
+    versions = []
+    for name, installed in (
+        ("docutils", True),
+        ("pygments", HAS_PYGMENTS),
+        ("matplotlib", HAS_MATPLOTLIB),
+    ):
+        try:
+            versions.append(f"{name}{metadata.version(name)}" if installed else "")
+        except metadata.PackageNotFoundError:
+            versions.append(name)
+    return tuple(versions)
+
+
+def _reveal_version() -> str:
+    """
+    Version of the bundled reveal.js, read from its ``package.json`` on every
+    call as the submodule may be updated between builds
+    """
+    try:
+        package_json = (REVEAL_PATH / "package.json").read_text(encoding="utf-8")
+        return json.loads(package_json)["version"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return ""
+
+
+def _register_directives() -> None:
+    """
+    Registers custom directives and roles in docutils (done when imported)
+    """
+    from . import VideoDirective, directives, roles  # noqa: F401
+
+
+@lru_cache(maxsize=None)
+def _get_html_writer():  # -> RST2RevealWriter (imported lazily)
+    """
+    Creates the docutils writer producing the slides, only once as it can be
+    reused by all the presentations parsed
+    """
+    from .RevealTranslator import RST2RevealTranslator, RST2RevealWriter
+
+    _register_directives()
+    html_writer = RST2RevealWriter()
+    html_writer.translator_class = RST2RevealTranslator
+    return html_writer
+
+
+@lru_cache(maxsize=None)
+def _get_docutils_settings():  # -> optparse.Values (imported lazily)
+    """
+    Computes docutils settings (reading its configuration files) only once,
+    each parse gets a copy of them
+    """
+    import docutils.core
+
+    publisher = docutils.core.Publisher(
+        "standalone", "restructuredtext", _get_html_writer()
+    )
+    publisher.process_programmatic_settings(None, None, None)
+    return publisher.settings
+
+
+@lru_cache(maxsize=None)
+def _set_user_locale() -> None:
+    """
+    Sets user's locale (used to format dates) once, when it is first needed
+    """
+    try:
+        locale.setlocale(locale.LC_ALL, "")
+    except locale.Error:
+        pass
 
 
 def parse_docutils_meta(meta_str: str) -> dict[str, str]:
@@ -73,18 +270,26 @@ def parse_docutils_meta(meta_str: str) -> dict[str, str]:
     Converts docutils ``meta`` tag into a dictionary of useful values
     """
     metadata = dict(authors=list(), date="")
-    for line in meta_str.splitlines():
-        tree = ElementTree.fromstring(line)
-        if tree.attrib.get("name", "") == "author":
-            author, _, email = tree.attrib["content"].partition("<")
+    for tag in _META_TAG_RE.finditer(meta_str):
+        attrib = {
+            key: html.unescape(value)
+            for key, value in _META_ATTR_RE.findall(tag.group(1))
+        }
+        if attrib.get("name", "") == "author":
+            author, _, email = attrib["content"].partition("<")
             metadata["authors"].append((author.strip(), email.replace(">", "")))
-        elif tree.attrib.get("name", "") == "date":
-            metadata["date"] = tree.attrib["content"].strip()
+        elif attrib.get("name", "") == "date":
+            metadata["date"] = attrib["content"].strip()
+    _set_user_locale()
+    # Tells if the date changes with the day the presentation is built
+    metadata["dated_now"] = True
     if metadata["date"]:
         try:  # You can pass a date format to use today's date
-            metadata["date"] = datetime.now().strftime(metadata["date"])
+            date = datetime.now().strftime(metadata["date"])
+            metadata["dated_now"] = date != metadata["date"]
+            metadata["date"] = date
         except ValueError:  # If it is not a date format just use it
-            pass
+            metadata["dated_now"] = False
     else:
         metadata["date"] = datetime.now().strftime("%B, %Y")
     return metadata
@@ -115,6 +320,7 @@ class Parser:
         slidenos: bool = False,
         no_controls: bool = False,
         no_progress: bool = False,
+        link_reveal: bool = False,
         **templates_kwargs: str,
     ):
         R"""Class converting a stand-alone reST file into a Reveal.js-powered
@@ -136,13 +342,15 @@ class Parser:
             - slidenos: Flag indicating if number of the slide must be shown.
             - no_controls: Flag indicating if slide controls must not be displayed.
             - no_progress: Flag indicating if progress bar must not be displayed.
+            - link_reveal: Flag indicating if Reveal.js files are hard linked
+            -   instead of copied (faster, but shared with the package).
             - \*\*templates_kwargs: Keyword arguments used in templates.
 
         You can also use your own fields in the templates.
 
         """
         # Create empty temporary directory
-        shutil.rmtree(STATIC_TMP_PATH, ignore_errors=True)
+        fast_rmtree(STATIC_TMP_PATH)
         STATIC_TMP_PATH.mkdir()
         # Input/Output files
         if not input_file.exists() and input_file.suffix == ".rst":
@@ -158,100 +366,208 @@ class Parser:
         self.theme = theme
         self.custom_css = custom_css
         self.transition = transition
-        self.slidenos = "'c/t'" if slidenos else "false"
-        self.controls = json.dumps(not no_controls)
-        self.progress = json.dumps(not no_progress)
+        self.reveal_config = {
+            "controls": not no_controls,
+            "progress": not no_progress,
+            "slideNumber": "c/t" if slidenos else False,
+            "transition": transition,
+        } | REVEAL_CONFIG
         # Pygments
         self.pygments_style = pygments_style
+        self.link_reveal = link_reveal
 
     def create_slides(self):
         """
         Creates the HTML5 presentation based on the arguments given to the
-        constructor.
+        constructor. Nothing is done if the presentation was already built
+        from the same input, options and dependencies (unless it shows today's
+        date) and all its output files are still there.
         """
-        # Copy the reveal library and _static files
-        self._copy_reveal()
-        self._copy_static()
-
-        # Create the writer and retrieve the parts
-        self.html_writer = RST2RevealWriter()
-        self.html_writer.translator_class = RST2RevealTranslator
-        with self.input_file.open("r", encoding="utf-8") as infile:
-            self.parts = docutils.core.publish_parts(
-                source=infile.read(), writer=self.html_writer
-            )
-        self.meta_info = parse_docutils_meta(self.parts["meta"])
-        self.meta_info["title"] = self.parts["title"]
-        self.meta_info["subtitle"] = self.parts["subtitle"]
-        # Produce the html file
-        self._produce_output()
-        # Copy generated temporary files
-        self._copy_temporary()
+        output_path = self.output_file.parent / self.output_file.stem
+        build_stamp_path = output_path / BUILD_STAMP_NAME
+        if self._is_built(build_stamp_path):
+            return
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Copy the reveal library and static files while the document is
+            # parsed
+            reveal_copied = executor.submit(self._copy_reveal)
+            static_copied = executor.submit(self._copy_static)
+
+            # Retrieve the parts
+            self.parts = self._publish_parts()
+            self.meta_info = parse_docutils_meta(self.parts["meta"])
+            self.meta_info["title"] = self.parts["title"]
+            self.meta_info["subtitle"] = self.parts["subtitle"]
+            # Produce the html file (static files must be there)
+            static_copied.result()
+            self._produce_output()
+            # Copy generated temporary files
+            self._copy_temporary()
+            reveal_copied.result()
         # Make it reveal-compatible
-        shutil.move(self.output_file, self.output_file.parent / "reveal" / "index.html")
-        shutil.copytree(self.static_path, self.output_file.parent / "reveal" / "static")
-        shutil.rmtree(
-            self.output_file.parent / self.output_file.stem, ignore_errors=True
-        )
-        shutil.move(
-            self.output_file.parent / "reveal",
-            self.output_file.parent / self.output_file.stem,
+        move(self.output_file, self.output_file.parent / "reveal" / "index.html")
+        self._move_static(self.output_file.parent / "reveal" / "static")
+        shutil.rmtree(output_path, ignore_errors=True)
+        move(self.output_file.parent / "reveal", output_path)
+        if not self.meta_info["dated_now"]:
+            self._write_build_stamp(build_stamp_path)
+
+    def _is_built(self, build_stamp_path: Path) -> bool:
+        """
+        Tells if build stamp at ``build_stamp_path`` matches current input,
+        options and dependencies, and every output file it lists is intact
+        """
+        try:
+            stamp = json.loads(build_stamp_path.read_text(encoding="utf-8"))
+            if stamp["digest"] != self._build_stamp(stamp["dependencies"]):
+                return False
+            return all(
+                os.stat(build_stamp_path.parent / name).st_size == size
+                for name, size in stamp["outputs"].items()
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+    def _write_build_stamp(self, build_stamp_path: Path) -> None:
+        """
+        Writes build stamp: digest, dependencies recorded by docutils and size
+        of every output file
+        """
+        output_path = build_stamp_path.parent
+        outputs = {}
+        for directory, _, names in os.walk(output_path):
+            for name in names:
+                path = os.path.join(directory, name)
+                outputs[os.path.relpath(path, output_path)] = os.stat(path).st_size
+        stamp = {
+            "digest": self._build_stamp(self.dependencies),
+            "dependencies": self.dependencies,
+            "outputs": outputs,
+        }
+        build_stamp_path.write_text(json.dumps(stamp), encoding="utf-8")
+
+    def _build_stamp(self, dependencies: Iterable[str]) -> str:
+        """
+        Digest of everything the presentation is built from: input file,
+        custom stylesheet, files the document depends on (included, images,
+        ...), reveal.js version and options
+        """
+        digest = hashlib.sha256(self.input_file.read_bytes())
+        if self.custom_css:
+            dependencies = (self.custom_css, *dependencies)
+        for path in dependencies:
+            digest.update(os.fsencode(path))
+            try:
+                digest.update(hashlib.sha256(Path(path).read_bytes()).digest())
+            except OSError:  # Missing dependencies are part of the digest too
+                digest.update(b"\0")
+        digest.update(
+            repr(
+                (
+                    __version__,
+                    _dependency_versions(),
+                    _reveal_version(),
+                    self.theme,
+                    self.custom_css,
+                    self.pygments_style,
+                    self.reveal_config,
+                    self.link_reveal,
+                )
+            ).encode("utf-8")
         )
+        return digest.hexdigest()
+
+    def _publish_parts(self) -> dict[str, str]:
+        """
+        Parses the input file with docutils. Files read while parsing
+        (included, images, ...) are kept in ``dependencies``
+        """
+        import docutils.core
+        from docutils.utils import DependencyList
+
+        self.html_writer = _get_html_writer()
+        settings = copy.copy(_get_docutils_settings())
+        settings.record_dependencies = DependencyList()
+        with self.input_file.open("rb") as infile, map_file(infile) as source:
+            # Newlines are translated as when reading the file in text mode
+            text = str(source, encoding="utf-8")
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+            # Writer reuses its parts dictionary, copy it
+            parts = dict(
+                docutils.core.publish_parts(
+                    source=text,
+                    writer=self.html_writer,
+                    settings=settings,
+                )
+            )
+        self.dependencies = [
+            os.path.abspath(path) for path in settings.record_dependencies.list
+        ]
+        return parts
 
     def _copy_reveal(self):
-        # Copy the reveal subfolder
+        # Copy the reveal subfolder skipping unecessary files and directories.
+        # Output must be a standalone folder, files are only hard linked when
+        # asked to, as editing them would change the installed package
+        reveal_path = os.path.realpath(REVEAL_PATH)
         shutil.rmtree(self.output_file.parent / "reveal", ignore_errors=True)
-        shutil.copytree(
-            os.path.realpath(REVEAL_PATH),
+        copytree_mt(
+            reveal_path,
             self.output_file.parent / "reveal",
+            ignore=lambda directory, names: (
+                REVEAL_IGNORED.intersection(names)
+                if directory == reveal_path
+                else ()
+            ),
+            copy_function=link_or_copy if self.link_reveal else shutil.copy2,
         )
-        # Delete unecessary directories
-        shutil.rmtree(self.output_file.parent / "reveal" / "test")
-        shutil.rmtree(self.output_file.parent / "reveal" / ".github")
-        shutil.rmtree(self.output_file.parent / "reveal" / "examples")
-        # Delete unecessary files
-        os.remove(self.output_file.parent / "reveal" / ".git")
-        os.remove(self.output_file.parent / "reveal" / ".gitignore")
-        os.remove(self.output_file.parent / "reveal" / "demo.html")
-        os.remove(self.output_file.parent / "reveal" / "index.html")
-        os.remove(self.output_file.parent / "reveal" / "LICENSE")
-        os.remove(self.output_file.parent / "reveal" / "README.md")
 
     def _copy_static(self):
         #  {{{
         """
-        Copy static files to destination folder
+        Copy static files to destination folder. Stylesheets are always
+        copied, users may edit them and they must not change package files
         """
         # Create directory tree
-        self.static_css_path.mkdir(parents=True, exist_ok=True)
-        self.static_js_path.mkdir(exist_ok=True)
-        self.static_img_path.mkdir(exist_ok=True)
+        try:
+            self.static_path.mkdir(parents=True)
+            self.is_static_created = True
+        except FileExistsError:
+            self.is_static_created = False
+        for path in (
+            self.static_css_path,
+            self.static_js_path,
+            self.static_img_path,
+        ):
+            path.mkdir(exist_ok=True)
         # Copy basic rst2reveal.css
         rst2reveal_css_path = STATIC_CSS_PATH / "rst2reveal.css"
         destination_path = self.static_css_path / rst2reveal_css_path.name
-        shutil.copy(rst2reveal_css_path, destination_path)
+        copy_file(rst2reveal_css_path, destination_path)
         self.rst2reveal_href = destination_path.relative_to(
             self.output_file.parent
         ).as_posix()
         # Copy custom stylesheet if defined
-        if (
-            self.custom_css
-            and (custom_css_path := Path(self.custom_css)).exists()
-            and custom_css_path.is_file()
-            and custom_css_path.suffix == ".css"
-        ):
+        custom_css_path = Path(self.custom_css or "")
+        try:  # Suffix is checked first, then a single stat call
+            is_custom_css = custom_css_path.suffix == ".css" and stat.S_ISREG(
+                custom_css_path.stat().st_mode
+            )
+        except OSError:
+            is_custom_css = False
+        if is_custom_css:
             destination_path = self.static_css_path / custom_css_path.name
-            shutil.copy(custom_css_path, destination_path)
+            copy_file(custom_css_path, destination_path)
             self.custom_css_href = destination_path.relative_to(
                 self.output_file.parent
             ).as_posix()
         else:
             self.custom_css_href = ""
         # Copy Pygments css if available
-        if PYGMENTS_STYLES:
-            pygments_css_path = next(write_pygments_css(self.pygments_style))
+        if HAS_PYGMENTS:
+            pygments_css_path = write_pygments_css(self.pygments_style or "default")
             destination_path = self.static_css_path / pygments_css_path.name
-            shutil.copy(pygments_css_path, destination_path)
+            copy_file(pygments_css_path, destination_path)
             self.pygments_href = destination_path.relative_to(
                 self.output_file.parent
             ).as_posix()
@@ -259,41 +575,50 @@ class Parser:
             self.pygments_href = ""
         #  }}}
 
+    def _move_static(self, destination: Path):
+        """
+        Move static files folder to ``destination``. It is only copied if it
+        existed before the build (it may hold user files) or if it can't be
+        renamed
+        """
+        if self.is_static_created:
+            try:
+                os.rename(self.static_path, destination)
+                return
+            except OSError:
+                pass
+        shutil.copytree(self.static_path, destination)
+        if self.is_static_created:
+            shutil.rmtree(self.static_path)
+
     def _copy_temporary(self):
-        """Copy temporary files to destination folder"""
-        # Copy generated images
-        for img in STATIC_TMP_PATH.glob("*.svg"):
-            if img.stat().st_size != 0:
-                shutil.copy2(img, self.static_img_path / img.name)
-            img.unlink()
+        """Move temporary files to destination folder"""
+        # Move generated images
+        with os.scandir(STATIC_TMP_PATH) as entries:
+            for img in entries:
+                if not img.name.endswith(".svg"):
+                    continue
+                if img.stat().st_size != 0:
+                    move(img.path, self.static_img_path / img.name)
+                else:
+                    os.unlink(img.path)
 
     def _produce_output(self):
         self.title = self.parts["title"]
-        header = self._generate_header()
         self._generate_titleslide()
-        body = self._generate_body()
-        footer = self._generate_body_end()
-
-        document_content = header + body + footer
-
-        with self.output_file.open("w", encoding="utf-8") as wfile:
-            wfile.write(document_content)
-
-    def _generate_body(self) -> str:
-        return (
-            "\n".join(
-                (
-                    " " * 2 + "<body>",
-                    " " * 4 + '<div class="reveal">',
-                    " " * 6 + '<div class="slides">',
-                    self.titleslide,
-                    self.parts["body"],
-                    " " * 6 + "</div>",
-                    " " * 4 + "</div>",
-                )
-            )
-            + "\n"
-        )
+        # Written piece by piece, the whole document is never held in memory
+        with self.output_file.open("wb", buffering=_WRITE_BUFSIZE) as wfile:
+            wfile.write(self._generate_header().encode("utf-8"))
+            self._write_body(wfile)
+            wfile.write(self._generate_body_end().encode("utf-8"))
+
+    def _write_body(self, wfile: BinaryIO):
+        wfile.write(BODY_OPEN)
+        wfile.write(self.titleslide.encode("utf-8"))
+        wfile.write(b"\n")
+        wfile.write(self.parts["body"].encode("utf-8"))
+        wfile.write(b"\n")
+        wfile.write(BODY_CLOSE)
 
     def _generate_titleslide(self):
         # Separators
@@ -302,127 +627,36 @@ class Parser:
             "." if self.meta_info.get("subtitle") != "" else ""
         )
 
-        self.titleslide = (
-            "\n".join(
-                [
-                    " " * 8 + '<section class="titleslide">',
-                    " " * 10 + f'<h1>{self.meta_info["title"]}</h1>',
-                    " " * 10 + f'<h3>{self.meta_info["subtitle"]}</h3>',
-                    " " * 10 + "<br>",
-                ]
-                + [
-                    " " * 10 + author_to_link(x, y)
-                    for x, y in self.meta_info["authors"]
-                ]
-                + [
-                    " " * 10 + f'<p>{self.meta_info["date"]}</p>',
-                    " " * 8 + "</section>",
-                ]
-            )
-            + "\n"
-        )
+        self.titleslide = TITLESLIDE_TEMPLATE % {
+            "title": self.meta_info["title"],
+            "subtitle": self.meta_info["subtitle"],
+            "authors": "".join(
+                _I10 + author_to_link(x, y) + "\n"
+                for x, y in self.meta_info["authors"]
+            ),
+            "date": self.meta_info["date"],
+        }
         self.footer_template = """<b>%(title)s %(is_subtitle)s %(subtitle)s.</b> %(author)s%(is_institution)s %(institution)s. %(date)s"""
 
     def _generate_header(self):
-        rst2reveal_css = (
-            f'<link rel="stylesheet" type="text/css" href="{self.rst2reveal_href}">'
-        )
-        pygments_css = (
-            f'<link rel="stylesheet" type="text/css" href="{self.pygments_href}">'
-            if PYGMENTS_STYLES
-            else ""
-        )
-        custom_css = (
-            f'<link rel="stylesheet" type="text/css" href="{self.custom_css_href}">'
-            if self.custom_css
-            else ""
-        )
-        return (
-            "\n".join(
-                [
-                    "<!doctype html>",
-                    f'<html lang="{locale.getdefaultlocale()[0]}">',
-                    " " * 2 + "<head>",
-                    " " * 4 + '<meta charset="utf-8">',
-                    " " * 4 + f"<title>{self.title}</title>",
-                    " " * 4 + f'<meta name="description" content="{self.title}">',
-                ]
-                + [" " * 4 + x for x in self.parts["meta"].splitlines()]
-                + [
-                    " " * 4
-                    + '<meta name="apple-mobile-web-app-capable" content="yes" />',
-                    " " * 4
-                    + '<meta name="apple-mobile-web-app-status-bar-style" content="black-translucent" />',
-                    " " * 4
-                    + '<meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=5.0, user-scalable=no">',
-                    " " * 4 + '<link rel="stylesheet" href="dist/reveal.css">',
-                    " " * 4
-                    + f'<link rel="stylesheet" href="dist/theme/{self.theme}.css" id="theme">',
-                    " " * 4
-                    + '<link rel="stylesheet" href="css/print/pdf.css" type="text/css" media="print">',
-                    " " * 4 + f"{pygments_css}",
-                    " " * 4 + f"{rst2reveal_css}",
-                    " " * 4 + "<!-- Extra styles -->",
-                    " " * 4 + f"{custom_css}",
-                    " " * 2 + "</head>",
-                ]
-            )
-            + "\n"
-        )
+        link_template = '<link rel="stylesheet" type="text/css" href="%s">'
+        return HEADER_TEMPLATE % {
+            "lang": _DEFAULT_LANG,
+            "title": self.title,
+            "meta": "".join(
+                _I4 + x + "\n" for x in self.parts["meta"].splitlines()
+            ),
+            "theme": self.theme,
+            "pygments_css": (
+                link_template % self.pygments_href if HAS_PYGMENTS else ""
+            ),
+            "rst2reveal_css": link_template % self.rst2reveal_href,
+            "custom_css": (
+                link_template % self.custom_css_href if self.custom_css else ""
+            ),
+        }
 
     def _generate_body_end(self):
-        return (
-            "\n".join(
-                (
-                    " " * 4 + '<script src="dist/reveal.js"></script>',
-                    " " * 4 + '<script src="plugin/zoom/zoom.js"></script>',
-                    " " * 4 + '<script src="plugin/notes/notes.js"></script>',
-                    " " * 4 + '<script src="plugin/search/search.js"></script>',
-                    " " * 4 + '<script src="plugin/markdown/markdown.js"></script>',
-                    " " * 4 + '<script src="plugin/highlight/highlight.js"></script>',
-                    " " * 4 + '<script src="plugin/math/math.js"></script>',
-                    " " * 4 + "<script>",
-                    " " * 6 + "Reveal.initialize({",
-                    " " * 8 + f"controls: {self.controls},",
-                    " " * 8 + f"progress: {self.progress},",
-                    " " * 8 + f"slideNumber: {self.slidenos},",
-                    " " * 8 + f"transition: {self.transition!r},",
-                    " " * 8 + "history: true,",
-                    " " * 8 + "overview: true,",
-                    " " * 8 + "keyboard: true,",
-                    " " * 8 + "loop: false,",
-                    " " * 8 + "touch: true,",
-                    " " * 8 + "rtl: false,",
-                    " " * 8 + "hash: true,",
-                    " " * 8 + "backgroundTransition: 'convex',",
-                    " " * 8 + "pdfSeparateFragments: false,",
-                    " " * 8 + "center: true,",
-                    " " * 8 + "mouseWheel: false,",
-                    " " * 8 + "fragments: true,",
-                    " " * 8 + "rollingLinks: false,",
-                    " " * 8 + "highlight: {highlightOnLoad: false},",
-                    " " * 8 + "math: {",
-                    " " * 10
-                    + "// mathjax: 'https://cdnjs.cloudflare.com/ajax/libs/mathjax/2.7.0/MathJax.js',",
-                    " " * 10 + "config: 'TeX-AMS_HTML-full',",
-                    " " * 10 + "TeX: {",
-                    " " * 12 + "Macros: {",
-                    " " * 14 + "R: '\\mathbb{R}',",
-                    " " * 16 + "set: [ '\\left\\{#1 \\; ; \\; #2\\right\\}', 2 ]",
-                    " " * 14 + "}",
-                    " " * 12 + "}",
-                    " " * 10 + "},",
-                    " " * 10 + "// Learn about plugins: https://revealjs.com/plugins/",
-                    " " * 10
-                    + "plugins: [ RevealMath, RevealZoom, RevealNotes, RevealSearch, RevealMarkdown, RevealHighlight ]",
-                    " " * 10 + "// Full list of configuration options available here:",
-                    " " * 10 + "// https://github.com/hakimel/reveal.js#configuration",
-                    " " * 8 + "}",
-                    " " * 6 + ");",
-                    " " * 4 + "</script>",
-                    " " * 2 + "</body>",
-                    "</html>",
-                )
-            )
-            + "\n"
-        )
+        # Keys go straight into the object literal, without the outer braces
+        config = json.dumps(self.reveal_config, indent=2)[1:-1].strip()
+        return BODY_END_TEMPLATE % {"config": config.replace("\n", "\n" + _I6)}
@@ -3,10 +3,32 @@
 
 __docformat__ = "reStructuredText"
 
+from functools import lru_cache
 from docutils import nodes
 from docutils.writers.html4css1 import HTMLTranslator, Writer
 
 
+# Indentation of the slides HTML
+_I8 = "        "
+_I10 = "          "
+_I12 = "            "
+
+
+@lru_cache(maxsize=1024)
+def _classes_string(classes: tuple[str, ...]) -> str:
+    return " class=" + " ".join(map('"{}"'.format, classes)) if classes else ""
+
+
+def _attribute_string(attr: str, values: tuple[str, ...]) -> str:
+    values_str = " ".join(x for x in values if x)
+    return f' {attr}="{values_str}"' if values_str else " " + attr
+
+
+@lru_cache(maxsize=1024)
+def _attributes_string(attributes: tuple[tuple[str, tuple[str, ...]], ...]) -> str:
+    return "".join(_attribute_string(attr, values) for attr, values in attributes)
+
+
 class RST2RevealWriter(Writer):
     """Writer to be used with the RevealTranslator class."""
 
@@ -41,6 +63,33 @@ class RST2RevealTranslator(HTMLTranslator):
     Derived from docutils.writers.html4css1.HTMLTranslator.
     """
 
+    # Sections (slides) HTML chunks
+    SECTION_OPEN = _I8 + "<section%s%s>\n"
+    SECTION_HEADER = _I10 + '<header class="section-header"></header>\n'
+    SECTION_FOOTER = _I10 + '<footer class="section-footer"></footer>\n'
+    SECTION_CLOSE = _I8 + "</section>\n"
+    SUBSECTION_OPEN = _I10 + "<section%s%s>\n"
+    SUBSECTION_HEADER = _I12 + '<header class="section-header"></header>\n'
+    SUBSECTION_FOOTER = _I12 + '<footer class="section-footer"></footer>\n'
+    SUBSECTION_CLOSE = _I10 + "</section>\n"
+    SECTION_END = (SECTION_FOOTER, SECTION_CLOSE)
+    SUBSECTION_END = (SUBSECTION_FOOTER, SUBSECTION_CLOSE)
+    # Columns HTML chunks
+    COLUMNS_OPEN = _I12 + '<div class="columns">\n'
+    COLUMNS_CLOSE = _I12 + "</div>\n"
+    # Title tag, class and closing tag by parent node type, in lookup order
+    TITLE_TAGS = {
+        nodes.topic: ("p", "topic-title first", _I12 + "</p>\n"),
+        nodes.sidebar: ("p", "sidebar-title", _I12 + "</p>\n"),
+        nodes.Admonition: ("p", "admonition-title", _I12 + "</p>\n"),
+        nodes.table: ("caption", "", _I12 + "</caption>\n"),
+        nodes.document: ("h2", "", _I12 + "</h2>\n"),
+        nodes.section: ("h2", "", _I12 + "</h2>\n"),
+    }
+    # Most sections have neither classes nor attributes
+    PLAIN_SECTION_OPEN = SECTION_OPEN % ("", "")
+    PLAIN_SUBSECTION_OPEN = SUBSECTION_OPEN % ("", "")
+
     def __init__(self, document):
         HTMLTranslator.__init__(self, document)
         self.math_output = "mathjax"
@@ -49,25 +98,22 @@ class RST2RevealTranslator(HTMLTranslator):
         self.inline_lists = False
 
     def starttag(self, node, tagname, suffix="\n", empty=False, **attributes):
-        all_attributes = attributes | node.attributes.get("html_attributes", {})
-        result = super().starttag(node, tagname, suffix, empty, **all_attributes)
-        # print(result)
-        return result
+        # Only a few nodes have extra HTML attributes, skip merging otherwise
+        if html_attributes := node.attributes.get("html_attributes"):
+            attributes |= html_attributes
+        return super().starttag(node, tagname, suffix, empty, **attributes)
 
+    # Strings are cached, most slides share the same classes and attributes
     @staticmethod
     def _get_classes_string(node) -> str:
-        classes = node.attributes.get("classes", [])
-        return " class=" + " ".join(map('"{}"'.format, classes)) if classes else ""
+        return _classes_string(tuple(node.attributes.get("classes", ())))
 
     @staticmethod
     def _get_attributes_string(node) -> str:
         attributes = node.attributes.get("html_attributes", {})
-        attr_chunk = list()
-        for attr, values in attributes.items():
-            values = list(filter(lambda x: x != "", values))
-            attr_vals = ('="' + " ".join(values) + '"') if values else ""
-            attr_chunk.append(attr + attr_vals)
-        return " " + " ".join(attr_chunk) if attributes else ""
+        return _attributes_string(
+            tuple((attr, tuple(values)) for attr, values in attributes.items())
+        )
 
     def depart_header(self, node) -> None:
         start = self.context.pop()
@@ -80,30 +126,24 @@ class RST2RevealTranslator(HTMLTranslator):
 
     def visit_title(self, node) -> None:
         """Only 6 section levels are supported by HTML."""
-        close_tag = " " * 12 + "</p>\n"
-        if isinstance(node.parent, nodes.topic):
-            self.body.append(
-                " " * 12 + self.starttag(node, "p", "", CLASS="topic-title first")
-            )
-        elif isinstance(node.parent, nodes.sidebar):
-            self.body.append(
-                " " * 12 + self.starttag(node, "p", "", CLASS="sidebar-title")
-            )
-        elif isinstance(node.parent, nodes.Admonition):
+        parent = node.parent
+        title_tag = self.TITLE_TAGS.get(type(parent))
+        if title_tag is None:
+            # Subclasses (i.e. all admonitions) need the slower checks
+            for parent_class, title_tag in self.TITLE_TAGS.items():
+                if isinstance(parent, parent_class):
+                    break
+            else:
+                raise AssertionError(f"Unexpected title parent {parent!r}")
+        tagname, class_name, close_tag = title_tag
+        if class_name:
             self.body.append(
-                " " * 12 + self.starttag(node, "p", "", CLASS="admonition-title")
+                _I12 + self.starttag(node, tagname, "", CLASS=class_name)
             )
-        elif isinstance(node.parent, nodes.table):
-            self.body.append(" " * 12 + self.starttag(node, "caption", ""))
-            close_tag = " " * 12 + "</caption>\n"
-        elif isinstance(node.parent, nodes.document):
-            self.body.append(" " * 12 + self.starttag(node, "h2", ""))
-            close_tag = " " * 12 + "</h2>\n"
-            self.in_document_title = len(self.body)
         else:
-            assert isinstance(node.parent, nodes.section)
-            self.body.append(" " * 12 + self.starttag(node, "h2", ""))
-            close_tag = " " * 12 + "</h2>\n"
+            self.body.append(_I12 + self.starttag(node, tagname, ""))
+        if isinstance(parent, nodes.document):
+            self.in_document_title = len(self.body)
         self.context.append(close_tag)
 
     def depart_title(self, node) -> None:
@@ -116,45 +156,57 @@ class RST2RevealTranslator(HTMLTranslator):
             del self.body[:]
 
     def visit_section(self, node) -> None:
-        class_str = self._get_classes_string(node)
-        attr_str = self._get_attributes_string(node)
+        if node.get("classes") or node.get("html_attributes"):
+            tag_strings = (
+                self._get_classes_string(node),
+                self._get_attributes_string(node),
+            )
+            section_open = self.SECTION_OPEN % tag_strings
+            subsection_open = self.SUBSECTION_OPEN % tag_strings
+        else:
+            section_open = self.PLAIN_SECTION_OPEN
+            subsection_open = self.PLAIN_SUBSECTION_OPEN
         if self.section_level == 0:
-            # Open new section
-            self.body.append(" " * 8 + f"<section{class_str}{attr_str}>\n")
-            self.body.append(" " * 10 + '<header class="section-header"></header>\n')
+            # Open new section and its first subsection
+            self.body.extend(
+                (
+                    section_open,
+                    self.SECTION_HEADER,
+                    subsection_open,
+                    self.SUBSECTION_HEADER,
+                )
+            )
         elif self.section_level == 1 and not self.is_subsection_previous:
             # First subsection needs to be closed at subsection opening
             self.is_subsection_previous = True
-            self.body.append(" " * 12 + '<footer class="section-footer"></footer>\n')
-            self.body.append(" " * 10 + "</section>\n")
-        # Open new subsection
-        self.body.append(" " * 10 + f"<section{class_str}{attr_str}>\n")
-        self.body.append(" " * 12 + '<header class="section-header"></header>\n')
+            self.body.extend(self.SUBSECTION_END)
+            self.body.extend((subsection_open, self.SUBSECTION_HEADER))
+        else:
+            # Open new subsection
+            self.body.extend((subsection_open, self.SUBSECTION_HEADER))
         self.section_level += 1
 
     def depart_section(self, node) -> None:
-        # When section has subsections, subsection tag is closed at depart
-        if not (self.section_level == 1 and self.is_subsection_previous):
-            # Close subsection
-            self.body.append(" " * 12 + '<footer class="section-footer"></footer>\n')
-            self.body.append(" " * 10 + "</section>\n")
-        if self.section_level == 1:
-            # Close section
+        if self.section_level != 1:
+            self.body.extend(self.SUBSECTION_END)
+        elif self.is_subsection_previous:
+            # When section has subsections, subsection tag is closed at depart
             self.is_subsection_previous = False
-            self.body.append(" " * 10 + '<footer class="section-footer"></footer>\n')
-            self.body.append(" " * 8 + "</section>\n")
+            self.body.extend(self.SECTION_END)
+        else:
+            self.body.extend(self.SUBSECTION_END + self.SECTION_END)
         self.section_level -= 1
         self.inline_lists = False
 
     def visit_column(self, node) -> None:
         if "column-left" in node.attributes["classes"]:
-            self.body.append(" " * 12 + '<div class="columns">\n')
+            self.body.append(self.COLUMNS_OPEN)
         self.visit_container(node)
 
     def depart_column(self, node) -> None:
         self.depart_container(node)
         if "column-right" in node.attributes["classes"]:
-            self.body.append(" " * 12 + "</div>\n")
+            self.body.append(self.COLUMNS_CLOSE)
 
     # def visit_literal_block(self, node) -> None:
     #    class_str = self._get_classes_string(node)
@@ -20,6 +20,16 @@ VIDEO_CODECS = {
     "mp4": "mp4",
 }
 
+# Template value for every supported option given its value.
+# TODO: no controls by default, but still clickable
+#   "controls": lambda _: "controls",
+VIDEO_OPTIONS = {
+    "width": str.strip,
+    "align": str.strip,
+    "autoplay": lambda _: "autoplay",
+    "loop": lambda _: "loop",
+}
+
 
 def video_directive(
     name,
@@ -54,27 +64,12 @@ def video_directive(
         "controls": "controls",
     }
     extra_args = content[1:]  # Because content[0] is ID
-    args = {}
-    import re
-
     for ea in extra_args:
-        name = re.findall(r":(.+):", ea)[0]
-        if len(re.findall(name + r":(.+)", ea)) > 0:
-            value = re.findall(name + r":(.+)", ea)[0]
-        else:
-            value = ""
-        args[name] = value
-    if "width" in args.keys():
-        string_vars["width"] = args["width"].strip()
-    if "align" in args.keys():
-        string_vars["align"] = args["align"].strip()
-    if "autoplay" in args.keys():
-        string_vars["autoplay"] = "autoplay"
-    if "loop" in args.keys():
-        string_vars["loop"] = "loop"
-    # TODO: no controls by default, but still clickable
-    #  if 'controls' in args.keys():
-    #      string_vars['controls'] = 'controls'
+        # Extra arguments are written as ``:name: value``
+        if ea.startswith(":"):
+            name, _, value = ea[1:].partition(":")
+            if (option := VIDEO_OPTIONS.get(name)) is not None:
+                string_vars[name] = option(value)
 
     return [nodes.raw("video", VIDEO_CODE % (string_vars), format="html")]
 
@@ -1,4 +1,6 @@
 import os
+from functools import lru_cache
+from importlib.util import find_spec
 from pathlib import Path
 
 __version__ = "1.0"
@@ -9,8 +11,21 @@ RST2REVEAL_PATH = Path(__file__).absolute().parent
 # Reveal related locations
 REVEAL_PATH = RST2REVEAL_PATH / "reveal"
 REVEAL_THEME_PATH = REVEAL_PATH / "dist" / "theme"
-REVEAL_THEMES = set(map(lambda x: x.stem, REVEAL_THEME_PATH.glob("*.css")))
-REVEAL_TRANSITIONS = [
+REVEAL_IGNORED = frozenset(
+    {
+        "test",
+        ".github",
+        "examples",
+        ".git",
+        ".gitignore",
+        "demo.html",
+        "index.html",
+        "LICENSE",
+        "README.md",
+    }
+)
+# Tuple keeps the order shown by --help
+REVEAL_TRANSITIONS = (
     "default",
     "cube",
     "page",
@@ -19,7 +34,7 @@ REVEAL_TRANSITIONS = [
     "linear",
     "fade",
     "none",
-]
+)
 
 # Custom static files locations
 STATIC_PATH = RST2REVEAL_PATH / "static"
@@ -29,27 +44,52 @@ STATIC_TMP_PATH = STATIC_PATH / "tmp"
 STATIC_JS_PATH = STATIC_PATH / "js"
 PYGMENTS_CSS_PATH = STATIC_CSS_PATH / "pygments"
 
+# Cache shared by all builds (rendered plots), in user's cache directory
+CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "rst2reveal"
+)
 
-# Check for pygments
-try:
-    from pygments.styles import STYLE_MAP
 
-    PYGMENTS_STYLES = set(STYLE_MAP.keys())
-except ImportError:
-    PYGMENTS_STYLES = set()
+# Check for pygments and matplotlib, both are slow to import so they are only
+# looked up here and imported when needed
+HAS_PYGMENTS = find_spec("pygments") is not None
+if not HAS_PYGMENTS:
     print("Pygments is not installed, code blocks won't be highlighted")
 
-# Check for matplotlib
-try:
+HAS_MATPLOTLIB = find_spec("matplotlib") is not None
+if not HAS_MATPLOTLIB:
+    print("Warning: Matplotlib is not installed. Plots will not be generated.")
+
+
+@lru_cache(maxsize=1)
+def get_reveal_themes() -> frozenset[str]:
+    """Returns available Reveal.js themes names"""
+    try:
+        with os.scandir(REVEAL_THEME_PATH) as entries:
+            return frozenset(
+                x.name[:-4] for x in entries if x.name.endswith(".css")
+            )
+    except FileNotFoundError:
+        return frozenset()
+
+
+@lru_cache(maxsize=1)
+def get_pygments_styles() -> frozenset[str]:
+    """Returns available pygments styles names"""
+    if not HAS_PYGMENTS:
+        return frozenset()
+    from pygments.styles import STYLE_MAP
+
+    return frozenset(STYLE_MAP)
+
+
+@lru_cache(maxsize=1)
+def register_fonts() -> None:
+    """Makes package fonts available to matplotlib"""
     from matplotlib import font_manager
 
-    HAS_MATPLOTLIB = True
     font_files = font_manager.findSystemFonts(
         fontpaths=[os.path.realpath(STATIC_FONT_PATH)]
     )
     for font_file in font_files:
         font_manager.fontManager.addfont(font_file)
-
-except ImportError:
-    HAS_MATPLOTLIB = False
-    print("Warning: Matplotlib is not installed. Plots will not be generated.")
@@ -3,13 +3,20 @@
 
 from __future__ import annotations
 
+import os
+import re
+import stat
 import sys
 import logging
-from argparse import ArgumentParser
-import configparser as ConfigParser
-from pathlib import Path
-from .Parser import Parser
-from . import PYGMENTS_STYLES, REVEAL_THEMES, REVEAL_TRANSITIONS
+from argparse import ArgumentParser, Namespace
+from functools import lru_cache
+from pathlib import Path, PurePath
+from . import (
+    HAS_PYGMENTS,
+    REVEAL_TRANSITIONS,
+    get_pygments_styles,
+    get_reveal_themes,
+)
 from typing import Optional, Sequence, Union
 
 
@@ -31,162 +38,279 @@ py_warnings_logger = logging.getLogger("py.warnings")
 py_warnings_logger.addHandler(stream_handler)
 
 
+# Configuration files suffixes, in order of preference
+CONFIG_SUFFIXES = (".cfg", ".conf", ".ini")
+
+
 def is_config_file(filepath: Path) -> bool:
     """
     Identifies configuration files
     """
-    return filepath.suffix in {".cfg", ".conf", ".ini"}
+    return filepath.name.endswith(CONFIG_SUFFIXES)
 
 
 def has_config_file(filepath: Path) -> Union[Path, None]:
     """
-    Check if configuration file exists for passed file
+    Check if configuration file exists for passed file. The folder is listed
+    once instead of checking every possible configuration file
     """
-    if (
-        (conf_filepath := filepath.with_suffix(".cfg")).exists()
-        or (conf_filepath := filepath.with_suffix(".conf")).exists()
-        or (conf_filepath := filepath.with_suffix(".ini")).exists()
-    ):
-        return conf_filepath
+    conf_filepaths = [filepath.with_suffix(suffix) for suffix in CONFIG_SUFFIXES]
+    conf_names = {x.name for x in conf_filepaths}
+    try:
+        with os.scandir(filepath.parent) as entries:
+            # File type comes with the listing, no need to stat
+            found = {
+                x.name for x in entries if x.name in conf_names and x.is_file()
+            }
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    # Suffixes are checked in order of preference
+    for conf_filepath in conf_filepaths:
+        if conf_filepath.name in found:
+            return conf_filepath
     return None
 
 
-# Allowed themes and transitions
-def main(argv: Optional[Sequence[str]] = None) -> int:
-    # Define arguments {{{
-    parser = ArgumentParser()
-    parser_boolean_arguments = {"slidenos", "no_controls", "no_progress"}
-    parser.description = """rst2reveal: ReST to Reveal.js slide generator."""
-    # Name of the ReST file to process
-    parser.add_argument(
-        "input_file",
-        type=str,
-        help="ReStructuredText file or configuration file to be parsed.",
-    )
+# Default configuration file, as written by RawConfigParser
+CONFIG_TEMPLATE = """\
+[rst2reveal]
+input_file = %(input_file)s
+theme = %(theme)s
+custom_css = %(custom_css)s
+transition = %(transition)s
+pygments_style = %(pygments_style)s
+slidenos = %(slidenos)s
+no_controls = %(no_controls)s
+no_progress = %(no_progress)s
+
+[firstslide]
+template = <h1>%%(title)s</h1>
+\t<h3>%%(subtitle)s</h3>
+\t<br>
+\t<p>%%(author)s%%(is_institution)s%%(institution)s</p>
+\t<p><small>%%(email)s</small></p>
+\t<p>%%(date)s</p>
+
+[footer]
+template = <b>%%(title)s %%(is_subtitle)s %%(subtitle)s.</b>%%(author)s\
+%%(is_institution)s %%(institution)s. %%(date)s
+
+"""
+
+# Flags that are stored as booleans in configuration files
+BOOLEAN_ARGUMENTS = {"slidenos", "no_controls", "no_progress", "link_reveal"}
+# Same values accepted by ConfigParser.getboolean
+BOOLEAN_STATES = {
+    "1": True,
+    "yes": True,
+    "true": True,
+    "on": True,
+    "0": False,
+    "no": False,
+    "false": False,
+    "off": False,
+}
+
+# Configuration files lines
+_SECTION_RE = re.compile(r"\[(?P<name>[^\]]+)\]")
+_OPTION_RE = re.compile(r"(?P<key>[^=:\s][^=:]*?)\s*[=:]\s*(?P<value>.*)")
+
+
+def read_config(filepath: Path) -> dict[str, dict[str, str]]:
+    """
+    Reads INI configuration file into a dictionary of sections. It is a much
+    faster replacement of ``RawConfigParser.read`` for our simple files, it
+    supports comments and multiline values (keeping their inner blank lines)
+    but no interpolation
+    """
+    config: dict[str, dict[str, str]] = {}
+    section: dict[str, str] = {}
+    key = ""
+    for line in filepath.read_text(encoding="utf-8").splitlines():
+        stripped = line.strip()
+        if not stripped:
+            if key:  # May be a blank line inside a multiline value
+                section[key] += "\n"
+            continue
+        if stripped[0] in "#;":
+            continue
+        if line[0].isspace() and key:
+            # Continuation of a multiline value
+            section[key] += "\n" + stripped
+        elif match := _SECTION_RE.fullmatch(stripped):
+            section = config.setdefault(match["name"], {})
+            key = ""
+        elif match := _OPTION_RE.fullmatch(stripped):
+            key = match["key"].lower()
+            section[key] = match["value"].strip()
+    # Blank lines after a value are not part of it
+    for section in config.values():
+        for key, value in section.items():
+            section[key] = value.rstrip()
+    return config
+
+
+# Command line arguments as (flags, options), callable choices are evaluated
+# when the parser is built
+ARGUMENTS: tuple[tuple[tuple[str, ...], dict], ...] = (
+    # Name of the ReST files to process
+    (
+        ("input_file",),
+        dict(
+            type=str,
+            nargs="+",
+            help="ReStructuredText files or configuration files to be parsed.",
+        ),
+    ),
     # Theme to use
-    parser.add_argument(
-        "-t",
-        "--theme",
-        type=str,
-        choices=REVEAL_THEMES,
-        default="simple",
-        help="Reveal.js theme (default: %(default)s)",
-    )
+    (
+        ("-t", "--theme"),
+        dict(
+            type=str,
+            choices=get_reveal_themes,
+            default="simple",
+            help="Reveal.js theme (default: %(default)s)",
+        ),
+    ),
     # Custom stylesheet
-    parser.add_argument(
-        "-s",
-        "--custom_css",
-        type=str,
-        default="",
-        help="Custom CSS file last-loaded.",
-    )
+    (
+        ("-s", "--custom_css"),
+        dict(type=str, default="", help="Custom CSS file last-loaded."),
+    ),
     # Transition
-    parser.add_argument(
-        "-r",
-        "--transition",
-        type=str,
-        choices=REVEAL_TRANSITIONS,
-        default="linear",
-        help="Reveal.js transition (default: %(default)s)",
-    )
-    # Pygments
-    if PYGMENTS_STYLES:
-        parser.add_argument(
-            "-p",
-            "--pygments_style",
+    (
+        ("-r", "--transition"),
+        dict(
             type=str,
-            default="default",
-            choices=PYGMENTS_STYLES,
-            help="Pygments style for code highlighting.",
+            choices=REVEAL_TRANSITIONS,
+            default="linear",
+            help="Reveal.js transition (default: %(default)s)",
+        ),
+    ),
+    # Pygments
+    *(
+        (
+            (
+                ("-p", "--pygments_style"),
+                dict(
+                    type=str,
+                    default="default",
+                    choices=get_pygments_styles,
+                    help="Pygments style for code highlighting.",
+                ),
+            ),
         )
+        if HAS_PYGMENTS
+        else ()
+    ),
     # Slide numbers
-    parser.add_argument(
-        "--slidenos",
-        action="store_true",
-        help="Flag for showing slide numbers.",
-    )
+    (
+        ("--slidenos",),
+        dict(action="store_true", help="Flag for showing slide numbers."),
+    ),
     # Controls
-    parser.add_argument(
-        "--no_controls", action="store_false", help="Flag for hidding controls."
-    )
+    (
+        ("--no_controls",),
+        dict(action="store_false", help="Flag for hidding controls."),
+    ),
     # Progress
-    parser.add_argument(
-        "--no_progress",
-        action="store_false",
-        help="Flag for hidding progress bar.",
-    )
-    #  }}}
-    args = parser.parse_args(argv)
-    input_file = Path(args.input_file)
-    if input_file.exists() and not input_file.is_file():
-        logger.error(f"{input_file!s} is not a valid file")
-        return 1
-    # Create configuration file if needed {{{
-    if not is_config_file(input_file) and has_config_file(input_file) is None:
-        # Copy default config file to given location
-        input_file = input_file.with_suffix(".conf")
-        logger.info(f"Creating configuration file {input_file!s}.")
-        config = ConfigParser.RawConfigParser()
-        config.add_section("rst2reveal")
-        config.set("rst2reveal", "input_file", str(input_file.with_suffix(".rst")))
-        config.set("rst2reveal", "theme", args.theme)
-        config.set("rst2reveal", "custom_css", args.custom_css)
-        config.set("rst2reveal", "transition", args.transition)
-        config.set("rst2reveal", "pygments_style", args.pygments_style)
-        config.set("rst2reveal", "slidenos", args.slidenos)
-        config.set("rst2reveal", "no_controls", args.no_controls)
-        config.set("rst2reveal", "no_progress", args.no_progress)
-        config.add_section("firstslide")
-        config.set(
-            "firstslide",
-            "template",
-            "\n".join(
-                (
-                    "<h1>%(title)s</h1>",
-                    "<h3>%(subtitle)s</h3>",
-                    "<br>",
-                    "<p>%(author)s%(is_institution)s%(institution)s</p>",
-                    "<p><small>%(email)s</small></p>",
-                    "<p>%(date)s</p>",
-                )
-            ),
-        )
-        config.add_section("footer")
-        config.set(
-            "footer",
-            "template",
-            (
-                "<b>%(title)s %(is_subtitle)s %(subtitle)s.</b>"
-                "%(author)s%(is_institution)s %(institution)s. %(date)s"
-            ),
-        )
-        # Writing our configuration file
-        config.write(input_file.open("w", encoding="latin-1"))
-    elif not is_config_file(input_file):
-        input_file = has_config_file(input_file)
-    # Read configuration file
-    logger.info(f"Reading from the configuration file {input_file!s}.")
-    config_parser = ConfigParser.RawConfigParser()
-    config_parser.read(input_file)
-    config_args = config_parser["rst2reveal"]
-    input_filename = config_args.pop("input_file", "")
-    # Not valid input_filename
-    if not input_filename.endswith(".rst") or Path(input_filename).parent.name:
-        logger.error(f"{input_filename!s} is not a valid RST file")
-        return 1
-    input_file = input_file.with_name(input_filename)
-    if not input_file.exists():
-        logger.error(f"{input_filename!s} does not exists")
-        return 1
-    # Incorporate config values to args
-    for key, value in config_args.items():
-        if key in parser_boolean_arguments:
-            setattr(args, key, config_args.getboolean(key))
-        else:
-            setattr(args, key, value)
+    (
+        ("--no_progress",),
+        dict(action="store_false", help="Flag for hidding progress bar."),
+    ),
+    # Hard links
+    (
+        ("--link_reveal",),
+        dict(
+            action="store_true",
+            help="Hard link Reveal.js files instead of copying them (faster, "
+            "but editing them changes the installed package).",
+        ),
+    ),
+)
 
+
+@lru_cache(maxsize=1)
+def get_argument_parser() -> ArgumentParser:
+    """
+    Returns command line arguments parser, built only once per process
+    """
+    parser = ArgumentParser()
+    parser.description = """rst2reveal: ReST to Reveal.js slide generator."""
+    for flags, options in ARGUMENTS:
+        if callable(choices := options.get("choices")):
+            options = options | {"choices": choices()}
+        parser.add_argument(*flags, **options)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = get_argument_parser().parse_args(argv)
+    input_files = args.input_file
     del args.input_file
+    # docutils setup is cached, so later files are built faster
+    status = 0
+    for input_file in input_files:
+        status = max(status, build(Path(input_file), Namespace(**vars(args))))
+    return status
+
+
+def build(input_file: Path, args: Namespace) -> int:
+    """
+    Builds the slides of one ReST (or configuration) file using ``args``
+    """
+    try:
+        # A single stat tells if it exists and if it is a file
+        if not stat.S_ISREG(input_file.stat().st_mode):
+            logger.error(f"{input_file!s} is not a valid file")
+            return 1
+    except FileNotFoundError:
+        pass
+    is_config = is_config_file(input_file)
+    conf_filepath = input_file if is_config else has_config_file(input_file)
+    if conf_filepath is None:
+        # Arguments come from the command line, no need to read them back
+        input_file = input_file.with_suffix(".rst")
+        if not input_file.exists():
+            logger.error(f"{input_file!s} does not exists")
+            return 1
+        # Save them in a configuration file for next runs
+        conf_filepath = input_file.with_suffix(".conf")
+        logger.info(f"Creating configuration file {conf_filepath!s}.")
+        config = CONFIG_TEMPLATE % {
+            "input_file": input_file.name,
+            "theme": args.theme,
+            "custom_css": args.custom_css,
+            "transition": args.transition,
+            "pygments_style": args.pygments_style,
+            "slidenos": args.slidenos,
+            "no_controls": args.no_controls,
+            "no_progress": args.no_progress,
+        }
+        conf_filepath.write_text(config, encoding="utf-8")
+    else:
+        # Read configuration file
+        logger.info(f"Reading from the configuration file {conf_filepath!s}.")
+        config_args = read_config(conf_filepath)["rst2reveal"]
+        input_filename = config_args.pop("input_file", "")
+        # Not valid input_filename
+        if PurePath(input_filename).suffix != ".rst":
+            logger.error(f"{input_filename!s} is not a valid RST file")
+            return 1
+        # Relative paths start at the configuration file folder
+        input_file = conf_filepath.parent / input_filename
+        if not input_file.exists():
+            logger.error(f"{input_filename!s} does not exists")
+            return 1
+        # Incorporate config values to args
+        vars(args).update(
+            (key, BOOLEAN_STATES[val.lower()] if key in BOOLEAN_ARGUMENTS else val)
+            for key, val in config_args.items()
+        )
+
     # Create the RST parser and create the slides
+    from .Parser import Parser
+
     parser = Parser(
         input_file=input_file,
         output_file=input_file.with_suffix(".html"),
@@ -4,29 +4,63 @@ Additional directives to get the most out of Reveal.js
 
 from __future__ import annotations
 import os
-import re
+import ast
+import time
+import shutil
+import hashlib
 from pathlib import Path
+from functools import lru_cache
+from types import CodeType
 from docutils import nodes
 from docutils.parsers.rst import Directive
 from docutils.parsers.rst import directives
 from docutils.parsers.rst.directives.images import Image
 from docutils.parsers.rst.directives.body import CodeBlock
 from docutils.parsers.rst.directives.body import Container
-from typing import Union, Literal, Callable
-from . import HAS_MATPLOTLIB, STATIC_TMP_PATH
+from typing import TYPE_CHECKING, Union, Literal, Callable, Optional
+from . import HAS_MATPLOTLIB, CACHE_PATH, STATIC_TMP_PATH, register_fonts
 from .transforms import HTMLAttributeTransform
+from .utils import copy_file
 
+if TYPE_CHECKING:  # matplotlib is only imported when plotting
+    import matplotlib.pyplot as plt
 
-if HAS_MATPLOTLIB:
-    import matplotlib.pylab as plt
 
+if HAS_MATPLOTLIB:
     NFIGS_CREATED = 0
+    # Figures reused by all plots, one for regular ones and another for xkcd
+    FIGURES: dict[bool, "plt.Figure"] = {}
+
+# Resolved once, plots are saved there
+STATIC_TMP_REALPATH = os.path.realpath(STATIC_TMP_PATH)
+# Options used to save every plot. The dpi only applies to rasterized
+# artists, without date SVGs of the same plot are identical
+SAVEFIG_OPTIONS = {"dpi": 600, "transparent": True, "metadata": {"Date": None}}
+# Cached plots not used for this long (in seconds) are removed
+PLOT_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+# Only numpy and pandas can be imported by matplotlib code
+SAFE_IMPORTS = frozenset(("numpy", "pandas"))
+# Class given to every column, by ``column`` directive argument
+COLUMN_CLASSES = {"left": "column-left", "right": "column-right"}
+# Class given to every matplotlib image
+MATPLOTLIB_CLASS = "matplotlib-container"
+
+
+# Characters removed from plot names
+FILENAME_DELETE = r'~`!@\#$%^&*()="\';,.<>\\|/{}[]'
+FILENAME_TABLE = str.maketrans("", "", FILENAME_DELETE)
+FILENAME_DELETE_BYTES = FILENAME_DELETE.encode("ascii")
 
 
 def filename(argument: str) -> str:
-    invalid_chars = r'~`!@\#$%^&*()="\';,.<>\\|/{}[]'
-    fname: str = "".join((x for x in argument if x not in invalid_chars))
-    return fname
+    # bytes.translate is several times faster for (usual) ASCII names
+    if argument.isascii():
+        return (
+            argument.encode("ascii")
+            .translate(None, FILENAME_DELETE_BYTES)
+            .decode("ascii")
+        )
+    return argument.translate(FILENAME_TABLE)
 
 
 def zero_to_one(argument: str) -> int:
@@ -36,6 +70,108 @@ def zero_to_one(argument: str) -> int:
     return val
 
 
+@lru_cache(maxsize=None)
+def pyplot():
+    """
+    Imports ``matplotlib.pylab`` on first use, so documents (and CLI calls)
+    without plots do not pay for its slow import. Plots are only saved to
+    files, so the non-interactive Agg backend is used and no GUI toolkit is
+    loaded
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pylab as plt
+
+    plt.ioff()
+    register_fonts()
+    return plt
+
+
+def get_figure(n_rows: int, n_cols: int, xkcd: bool) -> tuple:
+    """
+    Returns cleared figure (made current) and its new axes. Figures are
+    created once and reused, which is much cheaper than creating new ones.
+    Figure settings ``clear`` keeps are reset too, so no plot depends on the
+    ones rendered before it
+    """
+    plt = pyplot()
+    if (fig := FIGURES.get(xkcd)) is None:
+        fig = FIGURES[xkcd] = plt.figure()
+    else:
+        fig.clear()
+        rc_params = plt.rcParams
+        fig.set_layout_engine(None)
+        fig.set_size_inches(rc_params["figure.figsize"])
+        fig.set_dpi(rc_params["figure.dpi"])
+        fig.set_frameon(rc_params["figure.frameon"])
+        fig.patch.set_alpha(None)
+        fig.patch.set_linewidth(0.0)
+        fig.set_facecolor(rc_params["figure.facecolor"])
+        fig.set_edgecolor(rc_params["figure.edgecolor"])
+        plt.figure(fig)
+    return fig, fig.subplots(n_rows, n_cols)
+
+
+def plot_cache_path(*plot_args) -> Path:
+    """
+    Path where the SVG rendered from ``plot_args`` (code and options) is cached
+    between builds
+    """
+    from matplotlib import __version__ as matplotlib_version
+
+    key = repr((matplotlib_version, SAVEFIG_OPTIONS, plot_args)).encode("utf-8")
+    digest = hashlib.blake2b(key, digest_size=16).hexdigest()
+    return CACHE_PATH / f"matplot-{digest}.svg"
+
+
+@lru_cache(maxsize=1)
+def prune_plot_cache() -> None:
+    """
+    Removes cached plots (and interrupted writes) not used in the last
+    ``PLOT_CACHE_MAX_AGE`` seconds, only once per process
+    """
+    oldest = time.time() - PLOT_CACHE_MAX_AGE
+    try:
+        with os.scandir(CACHE_PATH) as entries:
+            for entry in entries:
+                if entry.name.startswith("matplot-") and (
+                    entry.stat().st_mtime < oldest
+                ):
+                    os.unlink(entry.path)
+    except FileNotFoundError:
+        pass
+
+
+def imported_modules(node: ast.AST) -> set[str]:
+    """Top-level modules imported by ``node``, ``""`` for dynamic imports"""
+    if isinstance(node, ast.Import):
+        return {alias.name.partition(".")[0] for alias in node.names}
+    if isinstance(node, ast.ImportFrom):
+        if node.level or not node.module:
+            return {""}
+        return {node.module.partition(".")[0]}
+    if isinstance(node, ast.Name) and node.id == "__import__":
+        return {""}
+    if isinstance(node, ast.Attribute) and node.attr == "__import__":
+        return {""}
+    return set()
+
+
+@lru_cache(maxsize=256)
+def compile_plot_code(code_as_text: str) -> Optional[CodeType]:
+    """
+    Compiles matplotlib code chunk, only once for every different chunk. The
+    same syntax tree is used to check imports, ``None`` is returned if code
+    imports anything but numpy and pandas
+    """
+    tree = ast.parse(code_as_text, "<matplotlib>")
+    for node in ast.walk(tree):
+        if not imported_modules(node) <= SAFE_IMPORTS:
+            return None
+    return compile(tree, "<matplotlib>", "exec")
+
+
 class CodeBlockDirective(CodeBlock):
     """
     Block of language-specific code. It is parsed using Pygments.
@@ -46,8 +182,7 @@ class CodeBlockDirective(CodeBlock):
     TODO: Use Reveal.js to highlight code and its capabilities to navigate it.
     """
 
-    option_spec = CodeBlock.option_spec.copy()
-    option_spec["linenos"] = directives.flag
+    option_spec = {**CodeBlock.option_spec, "linenos": directives.flag}
 
     def run(self):
         self.state.document.settings.syntax_highlight = "short"
@@ -56,6 +191,10 @@ class CodeBlockDirective(CodeBlock):
         return super().run()
 
 
+class column(nodes.container):
+    """Container laid out as a column, visited by ``visit_column``"""
+
+
 class ColumnDirective(Container):
     """
     Allows 2-columns layout. Strongly based on ``container`` directive.
@@ -68,15 +207,17 @@ class ColumnDirective(Container):
     has_content = True
 
     def run(self):
-        if (class_tail := self.arguments[0].lower()) in ("left", "right"):
-            self.arguments[0] = f"column-{class_tail}"
+        if class_name := COLUMN_CLASSES.get(self.arguments[0].lower()):
+            self.arguments[0] = class_name
         else:
             raise self.error(
                 'Invalid class attribute value for "%s" directive: "%s".'
                 % (self.name, self.arguments[0])
             )
         node = super().run()[0]
-        node.__class__.__name__ = "column"
+        # Only this node becomes a column, other containers are left alone
+        node.__class__ = column
+        node.tagname = "column"
         return [node]
 
 
@@ -93,22 +234,22 @@ class HTMLAttributeDirective(Directive):
     has_content = False
 
     def run(self):
-        try:
-            html_attrs, vals_keys = {}, []
-            for attr_info in self.arguments:
-                if attr_info.startswith(":"):
-                    if vals_keys:
-                        html_attrs[vals_keys.pop(0)] = ""
-                    vals_keys.append(attr_info.replace(":", ""))
-                else:
-                    html_attrs[vals_keys.pop(0)] = attr_info
-            if vals_keys:
-                html_attrs[vals_keys.pop(0)] = ""
-        except ValueError:
-            raise self.error(
-                'Invalid attributes for "%s" directive: "%s".'
-                % (self.name, ", ".join(self.arguments))
-            )
+        # Keys are given as ``:key:`` and followed by their value, if any
+        html_attrs, key = {}, None
+        for attr_info in self.arguments:
+            if attr_info.startswith(":"):
+                if key is not None:
+                    html_attrs[key] = ""
+                key = attr_info.replace(":", "")
+            elif key is not None:
+                html_attrs[key], key = attr_info, None
+            else:
+                raise self.error(
+                    'Invalid attributes for "%s" directive: "%s".'
+                    % (self.name, ", ".join(self.arguments))
+                )
+        if key is not None:
+            html_attrs[key] = ""
         node_list = []
         pending = nodes.pending(HTMLAttributeTransform, html_attrs)
         self.state_machine.document.note_pending(pending)
@@ -126,12 +267,14 @@ class MatplotlibDirective(Image):
     required_arguments: int = 0
     optional_arguments: int = 10
     final_argument_whitespace: bool = True
-    option_spec: dict[str, Callable] = Image.option_spec.copy()
-    option_spec["name"] = filename
-    option_spec["alpha"] = zero_to_one
-    option_spec["xkcd"] = directives.flag
-    option_spec["rows"] = int
-    option_spec["cols"] = int
+    option_spec: dict[str, Callable] = {
+        **Image.option_spec,
+        "name": filename,
+        "alpha": zero_to_one,
+        "xkcd": directives.flag,
+        "rows": int,
+        "cols": int,
+    }
     has_content: bool = True
 
     @property
@@ -140,35 +283,39 @@ class MatplotlibDirective(Image):
         if not (fname := self.options.pop("name", "")):
             global NFIGS_CREATED
             NFIGS_CREATED += 1
-            filepath = STATIC_TMP_PATH / f"matplot-{NFIGS_CREATED:04d}.svg"
-        else:
-            filepath = Path(STATIC_TMP_PATH / fname)
-        return os.path.realpath(filepath.with_suffix(".svg"))
+            fname = f"matplot-{NFIGS_CREATED:04d}"
+        # Names cannot contain path separators, just join them
+        return os.path.join(STATIC_TMP_REALPATH, fname + ".svg")
 
     def save_plot(
         self, code_as_text: str, fig: "plt.Figure", ax: "plt.Axes", alpha: float
     ) -> Union[Path, Literal[""]]:
         """Saves plot defined from matplotlib code chunk"""
-        unsafe_pattern = re.compile(r"\bimport\b (?!(numpy|pandas))")
-        if re.search(unsafe_pattern, code_as_text):
-            print(
-                'Error, your matplotlib code cannot contain "import" '
-                "statements. Only numpy and pandas are allowed."
-            )
-            return ""
         try:
-            exec(code_as_text)
+            if (code := compile_plot_code(code_as_text)) is None:
+                print(
+                    'Error, your matplotlib code cannot contain "import" '
+                    "statements. Only numpy and pandas are allowed."
+                )
+                return ""
+            exec(code, {"plt": pyplot(), "fig": fig, "ax": ax})
         except Exception as e:
-            print("Error while executing matplotlib code:")
-            print(*code_as_text.splitlines(), sep="\n\t")
-            print(e)
+            print(
+                "Error while executing matplotlib code:",
+                "\n\t".join(code_as_text.splitlines()),
+                e,
+                sep="\n",
+            )
             return ""
         # Set figure alpha
         fig.patch.set_alpha(alpha)
         ax.patch.set_alpha(alpha)
-        # Save the figure in a temporary SVG file
+        # Save the figure in a temporary SVG file. It is written aside and
+        # then renamed, so an interrupted build never leaves a partial SVG
         fig_path = self.temporary_filepath
-        fig.savefig(fig_path, dpi=600, transparent=True)
+        partial_path = f"{fig_path}.{os.getpid()}.part"
+        fig.savefig(partial_path, format="svg", **SAVEFIG_OPTIONS)
+        os.replace(partial_path, fig_path)
         return Path(fig_path)
 
     def run(self):
@@ -180,15 +327,29 @@ class MatplotlibDirective(Image):
         alpha = self.options.pop("alpha", 0)
         xkcd = self.options.pop("xkcd", "") is None
         n_rows = self.options.pop("rows", 1)
-        n_cols = self.options.pop("rows", 1)
-        if xkcd:
-            fig_path = ""
-            with plt.xkcd(1):
-                fig, axes = plt.subplots(n_rows, n_cols)
-                fig_path = self.save_plot(code, fig, axes, alpha)
+        n_cols = self.options.pop("cols", 1)
+        cache_path = plot_cache_path(code, alpha, xkcd, n_rows, n_cols)
+        prune_plot_cache()
+        if cache_path.is_file():
+            # Same plot was rendered before, reuse a copy of it (output files
+            # are never linked to the cache). Its age is reset, so it is kept
+            fig_path = Path(self.temporary_filepath)
+            copy_file(cache_path, fig_path)
+            os.utime(cache_path)
         else:
-            fig, axes = plt.subplots(n_rows, n_cols)
-            fig_path = self.save_plot(code, fig, axes, alpha)
+            if xkcd:
+                fig_path = ""
+                with pyplot().xkcd(1):
+                    fig, axes = get_figure(n_rows, n_cols, xkcd)
+                    fig_path = self.save_plot(code, fig, axes, alpha)
+            else:
+                fig, axes = get_figure(n_rows, n_cols, xkcd)
+                fig_path = self.save_plot(code, fig, axes, alpha)
+            if fig_path:
+                CACHE_PATH.mkdir(parents=True, exist_ok=True)
+                partial_path = f"{cache_path}.{os.getpid()}.part"
+                shutil.copy2(fig_path, partial_path)
+                os.replace(partial_path, cache_path)
         # Insert image as svg
         if not fig_path:
             return []
@@ -196,9 +357,9 @@ class MatplotlibDirective(Image):
         # Prepare `self` to use Image directive
         self.content = ""
         self.arguments.append(f"static/img/{Path(fig_path).name}")
-        self.options["align"] = self.options.get("align", "center")
+        self.options.setdefault("align", "center")
         node = super().run()[0]
-        node.attributes["classes"].append("matplotlib-container")
+        node["classes"].append(MATPLOTLIB_CLASS)
         return [node]
 
 
@@ -7,6 +7,7 @@ Define additonal roles commonly used in presentations.
 
 
 # Define the role
+from functools import lru_cache
 from docutils.parsers.rst import roles
 from docutils import nodes
 
@@ -17,13 +18,18 @@ def small_role(role, rawtext, text, lineno, inliner, options={}, content=[]):
     return [node], []
 
 
+@lru_cache(maxsize=64)
+def line_breaks(nb_lines: int) -> str:
+    return "<br>" * nb_lines
+
+
 def vspace_role(role, rawtext, text, lineno, inliner, options={}, content=[]):
     try:
         nb_lines = int(text)
     except ValueError:
         print("Error in ", rawtext, ": argument should be an integer.")
         nb_lines = 0
-    node = nodes.raw("", "<br>" * nb_lines, format="html")
+    node = nodes.raw("", line_breaks(nb_lines), format="html")
     return [node], []
 
 
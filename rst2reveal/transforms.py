@@ -1,7 +1,6 @@
 from __future__ import annotations
 from docutils import nodes
 from docutils.transforms import Transform
-from collections import defaultdict
 
 class HTMLAttributeTransform(Transform):
     """
@@ -15,18 +14,19 @@ class HTMLAttributeTransform(Transform):
         pending = self.startnode
         parent = pending.parent
         child = pending
+        skipped = (nodes.Invisible, nodes.system_message)
         while parent:
             # Check for appropriate following siblings:
-            for index in range(parent.index(child) + 1, len(parent)):
-                element = parent[index]
-                if (isinstance(element, nodes.Invisible)
-                    or isinstance(element, nodes.system_message)):
+            siblings = parent.children
+            for index in range(siblings.index(child) + 1, len(siblings)):
+                element = siblings[index]
+                if isinstance(element, skipped):
                     continue
-                element.attributes.setdefault(
-                    'html_attributes', defaultdict(list)
+                html_attributes = element.attributes.setdefault(
+                    'html_attributes', {}
                 )
                 for key, val in pending.details.items():
-                    element.attributes['html_attributes'][key].append(val)
+                    html_attributes.setdefault(key, []).append(val)
                 pending.parent.remove(pending)
                 return
             else:
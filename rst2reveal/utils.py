@@ -0,0 +1,112 @@
+"""
+File system helpers shared by the parser and the directives
+"""
+
+from __future__ import annotations
+import os
+import mmap
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from typing import BinaryIO, Callable, ContextManager, Iterable, Optional, Union
+
+
+def copytree_mt(
+    src: Path,
+    dst: Path,
+    max_workers: int = 8,
+    ignore: Optional[Callable[[str, list[str]], Iterable[str]]] = None,
+    copy_function: Callable[[str, str], object] = shutil.copy2,
+) -> None:
+    """
+    Copies directory tree ``src`` into ``dst`` spreading file copies across a
+    pool of threads, which pays off for trees made of many small files.
+    ``ignore`` and ``copy_function`` work as in ``shutil.copytree``, ignored
+    entries are never read
+    """
+
+    def _walk(src_dir: str, dst_dir: str):
+        os.makedirs(dst_dir, exist_ok=True)
+        with os.scandir(src_dir) as scanned:
+            entries = list(scanned)
+        if ignore is not None:
+            ignored = set(ignore(src_dir, [entry.name for entry in entries]))
+            entries = [entry for entry in entries if entry.name not in ignored]
+        for entry in entries:
+            dst_path = os.path.join(dst_dir, entry.name)
+            if entry.is_dir():
+                yield from _walk(entry.path, dst_path)
+            else:
+                yield executor.submit(copy_function, entry.path, dst_path)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for future in list(_walk(os.fspath(src), os.fspath(dst))):
+            future.result()
+
+
+def link_or_copy(src: str, dst: str) -> None:
+    """
+    Hard links ``src`` as ``dst`` so no data is copied, files are only copied
+    when that is not possible (e.g. across filesystems). Existing ``dst`` is
+    replaced unless it already is ``src``
+    """
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        if not os.path.samefile(src, dst):
+            os.unlink(dst)
+            link_or_copy(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def copy_file(src: str, dst: str) -> None:
+    """
+    Copies ``src`` as a new ``dst`` file. Existing ``dst`` is removed first, so
+    files hard linked to it (e.g. by older versions) are never written
+    """
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    shutil.copy2(src, dst)
+
+
+def fast_rmtree(path: Path) -> None:
+    """
+    Removes directory tree ``path`` (if it exists) reusing ``os.scandir``
+    cached information and deleting entries in inode order
+    """
+    try:
+        with os.scandir(path) as scanned:
+            entries = sorted(scanned, key=lambda entry: entry.inode())
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            fast_rmtree(entry.path)
+        else:
+            os.unlink(entry.path)
+    os.rmdir(path)
+
+
+def move(src: Path, dst: Path) -> None:
+    """
+    Moves ``src`` to ``dst`` with a single rename, ``shutil.move`` is only
+    used when that is not possible (e.g. across filesystems)
+    """
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.move(src, dst)
+
+
+def map_file(file: BinaryIO) -> ContextManager[Union[mmap.mmap, bytes]]:
+    """
+    Maps opened ``file`` into memory (read only) so it is not copied into a
+    Python object until needed. Empty files can't be mapped
+    """
+    if os.fstat(file.fileno()).st_size == 0:
+        return nullcontext(b"")
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
@@ -0,0 +1,122 @@
+import shutil
+import tempfile
+import unittest
+from configparser import RawConfigParser
+from pathlib import Path
+from unittest import mock
+
+from rst2reveal import cli
+
+DOCS_PATH = Path(__file__).absolute().parent.parent / "docs"
+
+
+def read_raw_config(filepath: Path) -> dict[str, dict[str, str]]:
+    """Reads ``filepath`` with ``RawConfigParser``, the reference"""
+    config = RawConfigParser()
+    config.read(filepath, encoding="utf-8")
+    return {name: dict(config[name]) for name in config.sections()}
+
+
+class ReadConfigTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_path = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp_path)
+
+    def assert_same_as_configparser(self, filepath: Path):
+        self.assertEqual(cli.read_config(filepath), read_raw_config(filepath))
+
+    def test_shipped_configuration(self):
+        self.assert_same_as_configparser(DOCS_PATH / "presentation.conf")
+
+    def test_written_configuration(self):
+        conf_path = self.tmp_path / "deck.conf"
+        conf_path.write_text(
+            cli.CONFIG_TEMPLATE
+            % {
+                "input_file": "deck.rst",
+                "theme": "simple",
+                "custom_css": "",
+                "transition": "linear",
+                "pygments_style": "default",
+                "slidenos": False,
+                "no_controls": True,
+                "no_progress": True,
+            },
+            encoding="utf-8",
+        )
+        self.assert_same_as_configparser(conf_path)
+
+    def test_multiline_values(self):
+        conf_path = self.tmp_path / "deck.conf"
+        conf_path.write_text(
+            "[first]\n"
+            "Key = one\n"
+            "\n"
+            "  two\n"
+            "; comment\n"
+            "\n"
+            "\n"
+            "  three\n"
+            "other: value\n"
+            "\n"
+            "[second]\n"
+            "empty =\n"
+            "\n",
+            encoding="utf-8",
+        )
+        self.assert_same_as_configparser(conf_path)
+        self.assertEqual(
+            cli.read_config(conf_path)["first"]["key"], "one\n\ntwo\n\n\nthree"
+        )
+
+
+class BuildTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_path = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp_path)
+        (self.tmp_path / "talks").mkdir()
+        (self.tmp_path / "talks" / "deck.rst").write_text("Title\n=====\n")
+        self.args = cli.get_argument_parser().parse_args(["unused.rst"])
+        del self.args.input_file
+
+    def build_from_config(self, input_filename: str) -> mock.Mock:
+        conf_path = self.tmp_path / "deck.conf"
+        conf_path.write_text(f"[rst2reveal]\ninput_file = {input_filename}\n")
+        with mock.patch("rst2reveal.Parser.Parser") as parser_class:
+            self.assertEqual(cli.build(conf_path, self.args), 0)
+        return parser_class
+
+    def test_path_qualified_input_file(self):
+        for input_filename in ("talks/deck.rst", "./talks/deck.rst"):
+            with self.subTest(input_filename=input_filename):
+                parser_class = self.build_from_config(input_filename)
+                self.assertTrue(
+                    parser_class.call_args.kwargs["input_file"].samefile(
+                        self.tmp_path / "talks" / "deck.rst"
+                    )
+                )
+
+    def test_invalid_input_file(self):
+        conf_path = self.tmp_path / "deck.conf"
+        conf_path.write_text("[rst2reveal]\ninput_file = talks/deck.txt\n")
+        with self.assertLogs(cli.logger, "ERROR"):
+            self.assertEqual(cli.build(conf_path, self.args), 1)
+
+
+class MainTest(unittest.TestCase):
+    def test_every_file_is_built(self):
+        with mock.patch.object(cli, "build", side_effect=[0, 1, 0]) as build:
+            self.assertEqual(cli.main(["a.rst", "b.conf", "c.rst"]), 1)
+        self.assertEqual(
+            [call.args[0] for call in build.call_args_list],
+            [Path("a.rst"), Path("b.conf"), Path("c.rst")],
+        )
+        # Every file gets its own arguments
+        first_args, second_args = (
+            call.args[1] for call in build.call_args_list[:2]
+        )
+        self.assertIsNot(first_args, second_args)
+
+
+if __name__ == "__main__":
+    unittest.main()
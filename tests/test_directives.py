@@ -0,0 +1,164 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from rst2reveal import HAS_MATPLOTLIB, directives
+
+PLOT_DOCUMENT = """\
+.. matplotlib::
+    :alpha: 1
+
+    ax.plot([1, 2, 3], [3, 1, 2])
+"""
+
+
+class FilenameTest(unittest.TestCase):
+    def test_ascii_names(self):
+        for name in ("plot", "my plot.v2", r'a~b`c!d@e\f#g$h%i^j&k*l(m)n=o"p'):
+            with self.subTest(name=name):
+                self.assertEqual(
+                    directives.filename(name),
+                    name.translate(directives.FILENAME_TABLE),
+                )
+
+    def test_non_ascii_names_are_kept(self):
+        self.assertEqual(directives.filename("gráfica.v2/ñ"), "gráficav2ñ")
+
+    def test_every_deleted_character(self):
+        self.assertEqual(
+            directives.filename(f"a{directives.FILENAME_DELETE}b"), "ab"
+        )
+        self.assertEqual(
+            directives.filename(f"á{directives.FILENAME_DELETE}b"), "áb"
+        )
+
+
+@unittest.skipUnless(HAS_MATPLOTLIB, "matplotlib is not installed")
+class GetFigureTest(unittest.TestCase):
+    def test_figure_is_reused_without_state(self):
+        plt = directives.pyplot()
+        fig, ax = directives.get_figure(1, 1, False)
+        ax.plot([1, 2], [2, 1])
+        ax.set_title("first")
+        fig.set_size_inches(1, 1)
+        reused_fig, reused_ax = directives.get_figure(1, 1, False)
+        self.assertIs(reused_fig, fig)
+        self.assertEqual(reused_fig.axes, [reused_ax])
+        self.assertFalse(reused_ax.lines)
+        self.assertEqual(reused_ax.get_title(), "")
+        self.assertEqual(
+            list(reused_fig.get_size_inches()), list(plt.rcParams["figure.figsize"])
+        )
+
+    def test_figure_settings_do_not_leak(self):
+        from matplotlib.colors import to_rgba
+
+        plt = directives.pyplot()
+        fig, _ = directives.get_figure(1, 1, False)
+        fig.set_layout_engine("constrained")
+        fig.set_facecolor("red")
+        fig.set_edgecolor("blue")
+        fig.patch.set_alpha(0.5)
+        fig.set_dpi(12)
+        reused_fig, _ = directives.get_figure(1, 1, False)
+        self.assertIs(reused_fig, fig)
+        self.assertIsNone(reused_fig.get_layout_engine())
+        self.assertEqual(
+            reused_fig.get_facecolor(), to_rgba(plt.rcParams["figure.facecolor"])
+        )
+        self.assertEqual(
+            reused_fig.get_edgecolor(), to_rgba(plt.rcParams["figure.edgecolor"])
+        )
+        self.assertEqual(reused_fig.get_dpi(), plt.rcParams["figure.dpi"])
+
+    def test_plot_does_not_depend_on_previous_ones(self):
+        def render(code: str) -> bytes:
+            fig, ax = directives.get_figure(1, 1, False)
+            exec(code, {"fig": fig, "ax": ax})
+            buffer = io.BytesIO()
+            # Fixed salt, so SVG ids do not change between renders
+            with directives.pyplot().rc_context({"svg.hashsalt": "rst2reveal"}):
+                fig.savefig(buffer, format="svg", **directives.SAVEFIG_OPTIONS)
+            return buffer.getvalue()
+
+        plot = "ax.plot([1, 2, 3], [3, 1, 2])"
+        first = render(plot)
+        render('fig.set_layout_engine("tight"); fig.set_facecolor("red")')
+        self.assertEqual(render(plot), first)
+
+    def test_xkcd_figure_is_kept_apart(self):
+        fig, _ = directives.get_figure(1, 1, False)
+        with directives.pyplot().xkcd(1):
+            xkcd_fig, _ = directives.get_figure(1, 1, True)
+        self.assertIsNot(xkcd_fig, fig)
+        self.assertIs(directives.get_figure(1, 1, False)[0], fig)
+
+    def test_grid_of_axes(self):
+        _, axes = directives.get_figure(2, 3, False)
+        self.assertEqual(axes.shape, (2, 3))
+
+
+@unittest.skipUnless(HAS_MATPLOTLIB, "matplotlib is not installed")
+class PlotCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp_path = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp_path)
+        self.cache_path = tmp_path / "cache"
+        self.output_path = tmp_path / "tmp"
+        self.output_path.mkdir()
+        for name, value in (
+            ("CACHE_PATH", self.cache_path),
+            ("STATIC_TMP_REALPATH", str(self.output_path)),
+        ):
+            patcher = mock.patch.object(directives, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        directives.prune_plot_cache.cache_clear()
+        self.addCleanup(directives.prune_plot_cache.cache_clear)
+
+    def publish(self, source: str = PLOT_DOCUMENT) -> mock.Mock:
+        """Parses ``source``, returns the mocked ``save_plot``"""
+        from docutils.core import publish_doctree
+
+        with mock.patch.object(
+            directives.MatplotlibDirective,
+            "save_plot",
+            autospec=True,
+            side_effect=directives.MatplotlibDirective.save_plot,
+        ) as save_plot:
+            publish_doctree(source, settings_overrides={"report_level": 5})
+        return save_plot
+
+    def test_cache_hit_skips_rendering(self):
+        self.assertEqual(self.publish().call_count, 1)
+        (cached,) = self.cache_path.iterdir()
+        (rendered,) = self.output_path.iterdir()
+        rendered.unlink()
+        self.assertEqual(self.publish().call_count, 0)
+        (copied,) = self.output_path.iterdir()
+        self.assertEqual(copied.read_bytes(), cached.read_bytes())
+        # Output is a copy, editing it does not change the cache
+        self.assertFalse(os.path.samefile(copied, cached))
+
+    def test_different_options_are_rendered(self):
+        self.publish()
+        save_plot = self.publish(PLOT_DOCUMENT.replace(":alpha: 1", ":xkcd:"))
+        self.assertEqual(save_plot.call_count, 1)
+        self.assertEqual(len(list(self.cache_path.iterdir())), 2)
+
+    def test_old_entries_are_pruned(self):
+        self.publish()
+        (cached,) = self.cache_path.iterdir()
+        age = directives.PLOT_CACHE_MAX_AGE + 60
+        os.utime(cached, (cached.stat().st_atime - age,) * 2)
+        directives.prune_plot_cache.cache_clear()
+        directives.prune_plot_cache()
+        self.assertFalse(cached.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
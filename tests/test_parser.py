@@ -0,0 +1,149 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from rst2reveal import HAS_PYGMENTS, Parser as parser_module
+from rst2reveal.Parser import BUILD_STAMP_NAME, Parser
+
+DECK = """\
+Title
+=====
+
+:date: %s
+
+Slide
+-----
+
+.. include:: part.rst
+"""
+
+
+class BuildTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_path = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp_path)
+        # Included files are looked up from the working directory
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp_path)
+        self.reveal_path = reveal_path = self.tmp_path / "reveal.js"
+        (reveal_path / "dist").mkdir(parents=True)
+        self.write_reveal("4.0.0")
+        for name, value in (("REVEAL_PATH", reveal_path), ("HAS_PYGMENTS", False)):
+            patcher = mock.patch.object(parser_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.output_path = self.tmp_path / "deck"
+        self.write_deck("2024-01-01", "First version")
+
+    def write_reveal(self, version: str):
+        package_path = self.reveal_path / "package.json"
+        package_path.write_text(f'{{"version": "{version}"}}')
+        (self.reveal_path / "dist" / "reveal.js").write_text(f"// reveal {version}")
+
+    def write_deck(self, date: str, part: str):
+        (self.tmp_path / "deck.rst").write_text(DECK % date, encoding="utf-8")
+        (self.tmp_path / "part.rst").write_text(part, encoding="utf-8")
+
+    def build(self, **kwargs) -> str:
+        parser = Parser(
+            self.tmp_path / "deck.rst", self.tmp_path / "deck.html", **kwargs
+        )
+        parser.create_slides()
+        return (self.output_path / "index.html").read_text(encoding="utf-8")
+
+    def test_unchanged_build_is_skipped(self):
+        self.build()
+        with mock.patch.object(
+            Parser, "_publish_parts", side_effect=AssertionError("rebuilt")
+        ):
+            self.build()
+
+    def test_included_file_change_rebuilds(self):
+        self.assertIn("First version", self.build())
+        (self.tmp_path / "part.rst").write_text("Second version")
+        self.assertIn("Second version", self.build())
+
+    def test_missing_output_rebuilds(self):
+        self.build()
+        (self.output_path / "dist" / "reveal.js").unlink()
+        self.build()
+        self.assertTrue((self.output_path / "dist" / "reveal.js").exists())
+
+    def test_reveal_update_rebuilds(self):
+        self.build()
+        self.write_reveal("5.0.0")
+        self.build()
+        reveal_js_path = self.output_path / "dist" / "reveal.js"
+        self.assertEqual(reveal_js_path.read_text(), "// reveal 5.0.0")
+
+    def test_link_reveal_change_rebuilds(self):
+        self.build()
+        self.build(link_reveal=True)
+        reveal_js_path = self.output_path / "dist" / "reveal.js"
+        self.assertEqual(reveal_js_path.stat().st_nlink, 2)
+        self.build()
+        self.assertEqual(reveal_js_path.stat().st_nlink, 1)
+
+    def test_today_date_is_not_stamped(self):
+        self.write_deck("%Y", "First version")
+        self.build()
+        self.assertFalse((self.output_path / BUILD_STAMP_NAME).exists())
+
+    def test_stylesheets_are_copies(self):
+        self.build()
+        css_path = self.output_path / "static" / "css" / "rst2reveal.css"
+        self.assertEqual(css_path.stat().st_nlink, 1)
+
+    def test_output_files_are_copies(self):
+        self.build()
+        reveal_js_path = self.output_path / "dist" / "reveal.js"
+        self.assertEqual(reveal_js_path.stat().st_nlink, 1)
+
+    def test_crlf_source(self):
+        html = self.build()
+        deck_path = self.tmp_path / "deck.rst"
+        deck_path.write_bytes(deck_path.read_bytes().replace(b"\n", b"\r\n"))
+        shutil.rmtree(self.output_path)
+        self.assertEqual(self.build(), html)
+
+
+@unittest.skipUnless(HAS_PYGMENTS, "pygments is not installed")
+class PygmentsCSSTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_path = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp_path)
+        patcher = mock.patch.object(
+            parser_module, "PYGMENTS_CSS_PATH", self.tmp_path
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        parser_module.write_pygments_css.cache_clear()
+        self.addCleanup(parser_module.write_pygments_css.cache_clear)
+
+    def test_outdated_stylesheet_is_regenerated(self):
+        import pygments
+
+        style_path = self.tmp_path / "default.css"
+        style_path.write_text("/* Generated by pygments 0.0 */\n.old {}\n")
+        self.assertEqual(parser_module.write_pygments_css("default"), style_path)
+        css = style_path.read_text()
+        self.assertTrue(
+            css.startswith(parser_module.PYGMENTS_CSS_HEADER % pygments.__version__)
+        )
+        self.assertNotIn(".old", css)
+
+    def test_current_stylesheet_is_reused(self):
+        import pygments
+
+        style_path = self.tmp_path / "default.css"
+        header = parser_module.PYGMENTS_CSS_HEADER % pygments.__version__
+        style_path.write_text(css := header + ".kept {}\n")
+        parser_module.write_pygments_css("default")
+        self.assertEqual(style_path.read_text(), css)
+
+
+if __name__ == "__main__":
+    unittest.main()